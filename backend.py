@@ -2,6 +2,7 @@ from flask import Flask, jsonify, request
 from data_ingestion.fetch_prices import CoinGeckoFetcher
 from flask_cors import CORS
 import requests
+import threading
 import time
 import os
 
@@ -12,6 +13,27 @@ from rag_pipeline.langchain_generator import LangChainCryptoGenerator
 generator = LangChainCryptoGenerator()
 fetcher = CoinGeckoFetcher()
 
+# CoinGecko boards only change every ~30s, so reuse recent responses
+COINGECKO_CACHE_TTL = 30  # seconds
+_coingecko_cache = {}
+_coingecko_cache_lock = threading.Lock()
+
+def cached_coingecko_get(url, params=None):
+    """GET a CoinGecko endpoint, serving responses younger than COINGECKO_CACHE_TTL from memory"""
+    key = (url, frozenset((params or {}).items()))
+    now = time.time()
+    with _coingecko_cache_lock:
+        entry = _coingecko_cache.get(key)
+        if entry and now < entry[0]:
+            return entry[1]
+
+    response = requests.get(url, params=params)
+    data = response.json()
+    if response.ok:
+        with _coingecko_cache_lock:
+            _coingecko_cache[key] = (now + COINGECKO_CACHE_TTL, data)
+    return data
+
 @app.route("/crypto_data", methods=["GET"])
 def get_prices():
     """Fetches live data from CoinGecko securely via the backend"""
@@ -22,8 +44,7 @@ def get_prices():
             "ids": "bitcoin,ethereum,dogecoin",
             "order": "market_cap_desc"
         }
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = cached_coingecko_get(url, params)
         return jsonify(data)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -78,8 +99,7 @@ from flask import Flask, jsonify
 @app.route('/api/coingecko/global')
 def get_coingecko_global():
     url = "https://api.coingecko.com/api/v3/global"
-    response = requests.get(url)
-    return jsonify(response.json())
+    return jsonify(cached_coingecko_get(url))
 
 import subprocess # To run external scripts if needed
 from flask import Flask, jsonify
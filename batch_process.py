@@ -1,43 +1,115 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import msgspec
 import os
 from datetime import datetime
 
+class PriceRecord(msgspec.Struct):
+    timestamp: str
+    crypto: str
+    price_usd: float
+
+# simple/price response: {"bitcoin": {"usd": 67000.0}, ...}
+_PRICES_DECODER = msgspec.json.Decoder(dict[str, dict[str, float]])
+
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+))
+
 def fetch_prices(crypto_ids, currency="usd"):
     url = "https://api.coingecko.com/api/v3/simple/price"
     params = {
         "ids": ",".join(crypto_ids),
         "vs_currencies": currency
     }
-    response = requests.get(url, params=params)
+    response = _SESSION.get(url, params=params, timeout=10)
     response.raise_for_status()
-    return response.json()
+    return _PRICES_DECODER.decode(response.content)
+
+def migrate_json_log(json_filename="crypto_price.json", filename="crypto_price.msgpack"):
+    """Append records from the legacy JSON history to the MessagePack log, at most once.
+
+    The JSON file is renamed before appending, so a crash mid-migration leaves
+    the history in the .migrated file instead of importing it twice.
+    """
+    if not os.path.exists(json_filename):
+        return
+
+    migrated_filename = json_filename + ".migrated"
+    os.replace(json_filename, migrated_filename)
+
+    with open(migrated_filename, "rb") as f:
+        records = msgspec.json.decode(f.read(), type=list[PriceRecord])
+
+    _append_frames(records, filename)
 
-def read_json(filename):
+def read_price_log(filename="crypto_price.msgpack"):
+    """Yield PriceRecords from a length-prefixed MessagePack log"""
     if not os.path.exists(filename):
-        return []
+        return
 
-    with open(filename, "r", encoding="utf-8") as f:
-        return json.load(f)
+    decoder = msgspec.msgpack.Decoder(PriceRecord)
+    with open(filename, "rb") as f:
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                break  # end of log, or a header torn by an interrupted write
+            size = int.from_bytes(header, "big")
+            payload = f.read(size)
+            if len(payload) < size:
+                break  # payload torn by an interrupted write
+            yield decoder.decode(payload)
 
-def update_json_batch(prices, filename="crypto_price.json"):
-    data = read_json(filename)
-    print(data)
-    timestamp = datetime.utcnow().isoformat() + "Z"
+def repair_price_log(filename="crypto_price.msgpack"):
+    """Cut off a frame torn by an interrupted write so appended frames stay aligned.
+
+    Walks every frame header, so run it once at startup rather than per append.
+    """
+    if not os.path.exists(filename):
+        return
+
+    with open(filename, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = f.seek(0)
+        while pos < end:
+            header = f.read(4)
+            if len(header) < 4:
+                break
+            size = int.from_bytes(header, "big")
+            if pos + 4 + size > end:
+                break
+            pos = f.seek(size, os.SEEK_CUR)
+        if pos < end:
+            f.truncate(pos)
 
-    for crypto, value in prices.items():
-        data.append({
-            "timestamp": timestamp,
-            "crypto": crypto,
-            "price_usd": value["usd"]
-        })
+def _append_frames(records, filename):
+    encoder = msgspec.msgpack.Encoder()
 
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    frames = bytearray()
+    for record in records:
+        buf = encoder.encode(record)
+        frames += len(buf).to_bytes(4, "big")
+        frames += buf
+
+    with open(filename, "ab") as f:
+        f.write(frames)
+
+def update_json_batch(prices, filename="crypto_price.msgpack"):
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    _append_frames(
+        [PriceRecord(timestamp, crypto, value["usd"]) for crypto, value in prices.items()],
+        filename
+    )
 if __name__ == "__main__":
     cryptos = ["bitcoin", "ethereum", "solana"]
 
+    repair_price_log()
+    migrate_json_log()
     prices = fetch_prices(cryptos)
     update_json_batch(prices)
 
-    print("JSON batch update completed.")
+    print("Price log batch update completed.")
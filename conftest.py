@@ -0,0 +1 @@
+# Makes root-level modules such as batch_process importable from tests/
@@ -187,7 +187,7 @@ async def query_knowledge(
             "vector-retrieval",
             "/rag-query",
             "POST",
-            request.dict()
+            request.model_dump()
         )
         
         return {
@@ -212,12 +212,12 @@ async def trigger_data_fetch(
             "ingestion",
             "/fetch-now",
             "POST",
-            request.dict()
+            request.model_dump()
         )
         
         return {
             "status": "success",
-            "fetch_request": request.dict(),
+            "fetch_request": request.model_dump(),
             "result": result,
             "timestamp": datetime.utcnow()
         }
@@ -98,7 +98,7 @@ async def set_cache(item: CacheItem):
         else:
             await redis_client.set(item.key, serialized_value)
         
-        logger.info(f"Cache set: {item.key} (TTL: {item.ttl})")
+        logger.info("Cache set: %s (TTL: %s)", item.key, item.ttl)
         
         return {
             "status": "success",
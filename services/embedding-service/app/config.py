@@ -18,9 +18,11 @@ class Settings(BaseSettings):
     
     # Embedding model
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_device: str = os.getenv("EMBEDDING_DEVICE", "")  # empty = cuda if available, else cpu
     batch_size: int = 32
     
     class Config:
         env_file = ".env"
+        frozen = True
 
 settings = Settings()
\ No newline at end of file
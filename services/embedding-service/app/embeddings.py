@@ -1,5 +1,7 @@
 import asyncio
+import functools
 import chromadb
+import torch
 from typing import List, Dict, Any, Optional
 from sentence_transformers import SentenceTransformer
 from datetime import datetime
@@ -15,19 +17,31 @@ class EmbeddingProcessor:
     """Processes facts to generate embeddings and store in ChromaDB"""
     
     def __init__(self):
-        self.model = SentenceTransformer(settings.embedding_model)
+        device = settings.embedding_device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = SentenceTransformer(settings.embedding_model, device=device)
+        if device.startswith("cuda"):
+            # fp16 halves memory traffic and runs on tensor cores
+            self.model.half()
         self.chroma_client = None
         self.collection = None
         self.message_queue = MessageQueue(settings.redis_url)
         self.db_adapter = None
         
+        # Evaluation loops re-issue identical queries; memoize their embeddings
+        self._encode_query = functools.lru_cache(maxsize=512)(self._encode_query_uncached)
+        
     async def initialize(self):
         """Initialize ChromaDB connection and message queue"""
         try:
             self.chroma_client = chromadb.HttpClient(host=settings.chroma_url)
             self.collection = self.chroma_client.get_or_create_collection(
                 name="crypto_facts",
-                metadata={"description": "Crypto knowledge facts with embeddings"}
+                metadata={
+                    "description": "Crypto knowledge facts with embeddings",
+                    "hnsw:space": "ip",  # embeddings are normalized in _encode
+                    "hnsw:M": 16,
+                    "hnsw:construction_ef": 100
+                }
             )
             await self.message_queue.connect()
             logger.info("EmbeddingProcessor initialized successfully")
@@ -35,6 +49,19 @@ class EmbeddingProcessor:
             logger.error(f"Failed to initialize EmbeddingProcessor: {e}")
             raise
     
+    def _encode(self, texts: List[str]):
+        """Encode texts in model-sized batches into normalized numpy embeddings"""
+        return self.model.encode(
+            texts,
+            batch_size=settings.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+    
+    def _encode_query_uncached(self, query_text: str) -> tuple:
+        return tuple(self._encode([query_text])[0].tolist())
+    
     async def process_fact(self, fact: CryptoFact) -> bool:
         """Process a single fact to generate and store embedding"""
         try:
@@ -42,33 +69,37 @@ class EmbeddingProcessor:
             if not hasattr(fact, 'retrieval_time') or fact.retrieval_time is None:
                 fact.update_retrieval_time()
             
-            # Generate embedding
-            embedding = self.model.encode(fact.content).tolist()
-            fact.embedding = embedding
+            # Generate embedding unless the caller already batch-encoded it
+            if fact.embedding is None:
+                fact.embedding = self._encode([fact.content])[0].tolist()
             
             # Store in ChromaDB
-            await self._store_in_chromadb(fact)
+            await self._store_in_chromadb([fact])
             
             # Publish to storage queue for database persistence
-            await self.message_queue.publish(settings.storage_queue, {
-                "action": "store_fact",
-                "fact": fact.dict(),
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            await self._publish_stored_fact(fact)
             
-            logger.info(f"Processed fact {fact.id} for symbol {fact.symbol}")
+            logger.info("Processed fact %s for symbol %s", fact.id, fact.symbol)
             return True
             
         except Exception as e:
             logger.error(f"Failed to process fact {fact.id}: {e}")
             return False
     
-    async def _store_in_chromadb(self, fact: CryptoFact):
-        """Store fact with embedding in ChromaDB"""
+    async def _publish_stored_fact(self, fact: CryptoFact):
+        """Publish a stored fact to the storage queue for database persistence"""
+        await self.message_queue.publish(settings.storage_queue, {
+            "action": "store_fact",
+            "fact": fact.model_dump(),
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    
+    async def _store_in_chromadb(self, facts: List[CryptoFact]):
+        """Store facts with embeddings in ChromaDB in a single add"""
         try:
             self.collection.add(
-                embeddings=[fact.embedding],
-                documents=[fact.content],
+                embeddings=[fact.embedding for fact in facts],
+                documents=[fact.content for fact in facts],
                 metadatas=[{
                     "id": fact.id,
                     "symbol": fact.symbol,
@@ -78,12 +109,12 @@ class EmbeddingProcessor:
                     "timestamp": fact.timestamp.isoformat(),
                     "retrieval_time": fact.retrieval_time.isoformat(),
                     "verified": fact.verified
-                }],
-                ids=[fact.id]
+                } for fact in facts],
+                ids=[fact.id for fact in facts]
             )
-            logger.debug(f"Stored fact {fact.id} in ChromaDB")
+            logger.debug("Stored %d facts in ChromaDB", len(facts))
         except Exception as e:
-            logger.error(f"Failed to store fact {fact.id} in ChromaDB: {e}")
+            logger.error(f"Failed to store {len(facts)} facts in ChromaDB: {e}")
             raise
     
     async def batch_process_facts(self, facts: List[CryptoFact]) -> Dict[str, int]:
@@ -100,19 +131,34 @@ class EmbeddingProcessor:
                 if not hasattr(fact, 'retrieval_time') or fact.retrieval_time is None:
                     fact.update_retrieval_time()
             
-            # Generate embeddings for batch
-            texts = [fact.content for fact in batch]
-            embeddings = self.model.encode(texts).tolist()
+            # Encode and store the whole batch with one model call and one
+            # ChromaDB add; if either fails (e.g. CUDA OOM on the batch), fall
+            # back to per-fact processing so one failure doesn't sink the rest
+            try:
+                texts = [fact.content for fact in batch]
+                embeddings = self._encode(texts).tolist()
+                for fact, embedding in zip(batch, embeddings):
+                    fact.embedding = embedding
+                
+                await self._store_in_chromadb(batch)
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} facts failed, processing individually: {e}")
+                for fact in batch:
+                    if await self.process_fact(fact):
+                        results["success"] += 1
+                    else:
+                        results["failed"] += 1
+                continue
             
-            # Process each fact in batch
-            for fact, embedding in zip(batch, embeddings):
-                fact.embedding = embedding
-                if await self.process_fact(fact):
+            for fact in batch:
+                try:
+                    await self._publish_stored_fact(fact)
                     results["success"] += 1
-                else:
+                except Exception as e:
+                    logger.error(f"Failed to publish fact {fact.id}: {e}")
                     results["failed"] += 1
         
-        logger.info(f"Batch processing completed: {results}")
+        logger.info("Batch processing completed: %s", results)
         return results
     
     async def query_similar_facts(
@@ -124,7 +170,7 @@ class EmbeddingProcessor:
         """Query for similar facts using semantic search"""
         try:
             # Generate query embedding
-            query_embedding = self.model.encode(query_text).tolist()
+            query_embedding = list(self._encode_query(query_text))
             
             # Prepare where clause for filtering
             where_clause = {}
@@ -141,12 +187,12 @@ class EmbeddingProcessor:
             # Format results
             formatted_results = []
             if results['documents'] and results['documents'][0]:
-                for i, doc in enumerate(results['documents'][0]):
-                    formatted_results.append({
-                        "content": doc,
-                        "metadata": results['metadatas'][0][i],
-                        "distance": results['distances'][0][i] if 'distances' in results else None
-                    })
+                documents = results['documents'][0]
+                distances = results['distances'][0] if results.get('distances') else [None] * len(documents)
+                formatted_results = [
+                    {"content": doc, "metadata": metadata, "distance": distance}
+                    for doc, metadata, distance in zip(documents, results['metadatas'][0], distances)
+                ]
             
             return formatted_results
             
@@ -160,18 +206,39 @@ class EmbeddingProcessor:
         
         while True:
             try:
-                # Pop fact from queue
+                # Block for the first fact, then drain whatever else is already
+                # queued (up to batch_size) so it is encoded and stored together
                 message = await self.message_queue.pop_from_queue(
                     settings.embedding_queue, 
                     timeout=5
                 )
                 
-                if message:
-                    # Parse fact from message
+                messages = []
+                while message:
+                    messages.append(message)
+                    if len(messages) >= settings.batch_size:
+                        break
+                    try:
+                        message = await self.message_queue.pop_from_queue(settings.embedding_queue)
+                    except Exception as e:
+                        # Already-popped messages are gone from Redis; process them anyway
+                        logger.error(f"Error draining embedding queue: {e}")
+                        break
+                
+                # Parse facts from messages; a malformed one is skipped, not the whole batch
+                facts = []
+                for message in messages:
                     fact_data = message.get('fact')
                     if fact_data:
-                        fact = CryptoFact(**fact_data)
-                        await self.process_fact(fact)
+                        try:
+                            facts.append(CryptoFact(**fact_data))
+                        except Exception as e:
+                            logger.error(f"Skipping malformed fact message: {e}")
+                
+                if len(facts) == 1:
+                    await self.process_fact(facts[0])
+                elif facts:
+                    await self.batch_process_facts(facts)
                 
             except Exception as e:
                 logger.error(f"Error processing embedding queue: {e}")
@@ -1,6 +1,8 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from sentence_transformers import SentenceTransformer
+from sklearn.metrics.pairwise import cosine_similarity
+import torch
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 import logging
@@ -22,6 +24,7 @@ app.add_middleware(
 
 # Configuration
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
 
 # Global model instance
 model = None
@@ -49,8 +52,11 @@ async def startup_event():
     """Initialize the embedding model"""
     global model
     try:
-        logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
-        model = SentenceTransformer(EMBEDDING_MODEL)
+        logger.info(f"Loading embedding model: {EMBEDDING_MODEL} on {EMBEDDING_DEVICE}")
+        model = SentenceTransformer(EMBEDDING_MODEL, device=EMBEDDING_DEVICE)
+        if EMBEDDING_DEVICE.startswith("cuda"):
+            # fp16 halves memory traffic and runs on tensor cores
+            model.half()
         logger.info("Embedding model loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load embedding model: {e}")
@@ -117,9 +123,6 @@ async def calculate_similarity(request: SimilarityRequest):
         embeddings = model.encode([request.text1, request.text2])
         
         # Calculate cosine similarity
-        from sklearn.metrics.pairwise import cosine_similarity
-        import numpy as np
-        
         similarity = cosine_similarity(
             embeddings[0].reshape(1, -1),
             embeddings[1].reshape(1, -1)
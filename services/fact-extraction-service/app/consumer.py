@@ -2,12 +2,25 @@ import redis.asyncio as redis
 import json
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from .extractor import FactExtractor
 from .schemas import ExtractedFact, QueueStats
 
+try:
+    import orjson
+    
+    def _dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+    
+    _loads = orjson.loads
+except ImportError:  # fall back to stdlib json when orjson isn't installed
+    def _dumps(value: Any) -> str:
+        return json.dumps(value)
+    
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 class CryptoDataConsumer:
@@ -115,7 +128,7 @@ class CryptoDataConsumer:
             raw_data = {
                 "source": fields.get("source", ""),
                 "symbol": fields.get("symbol", ""),
-                "data": json.loads(fields.get("data", "{}")),
+                "data": _loads(fields.get("data", "{}")),
                 "timestamp": fields.get("timestamp", ""),
                 "message_id": fields.get("message_id", message_id)
             }
@@ -123,39 +136,49 @@ class CryptoDataConsumer:
             # Extract facts
             facts = await self.extractor.extract_facts(raw_data)
             
-            # Publish facts to output stream
-            for fact in facts:
-                await self._publish_fact(fact)
-                self.stats["facts_published"] += 1
+            # Publish all of the message's facts in one round trip
+            await self._publish_facts(facts)
+            self.stats["facts_published"] += len(facts)
             
-            logger.debug(f"Processed message {message_id}: extracted {len(facts)} facts")
+            logger.debug("Processed message %s: extracted %d facts", message_id, len(facts))
             
         except Exception as e:
             logger.error(f"Error processing message {message_id}: {e}")
             raise
     
-    async def _publish_fact(self, fact: ExtractedFact):
-        """Publish extracted fact to output stream"""
+    def _build_fact_message(self, fact: ExtractedFact, extracted_at: str) -> Dict[str, str]:
+        """Build the stream fields for an extracted fact"""
+        return {
+            "token": fact.token,
+            "attribute": fact.attribute,
+            "value": _dumps(fact.value) if not isinstance(fact.value, str) else fact.value,
+            "timestamp": fact.timestamp.isoformat(),
+            "source": fact.source.value,
+            "confidence": str(fact.confidence),
+            "fact_type": fact.fact_type.value,
+            "metadata": _dumps(fact.metadata),
+            "extracted_at": extracted_at
+        }
+    
+    async def _publish_facts(self, facts: List[ExtractedFact]) -> list:
+        """Publish extracted facts to the output stream in a single pipeline"""
+        if not facts:
+            return []
+        
         try:
-            fact_data = {
-                "token": fact.token,
-                "attribute": fact.attribute,
-                "value": json.dumps(fact.value) if not isinstance(fact.value, str) else fact.value,
-                "timestamp": fact.timestamp.isoformat(),
-                "source": fact.source.value,
-                "confidence": str(fact.confidence),
-                "fact_type": fact.fact_type.value,
-                "metadata": json.dumps(fact.metadata),
-                "extracted_at": datetime.utcnow().isoformat()
-            }
+            extracted_at = datetime.utcnow().isoformat()
+            pipe = self.redis_client.pipeline(transaction=False)
+            
+            for fact in facts:
+                pipe.xadd(self.output_stream, self._build_fact_message(fact, extracted_at))
             
-            message_id = await self.redis_client.xadd(self.output_stream, fact_data)
+            message_ids = await pipe.execute()
             
-            logger.debug(f"Published fact for {fact.token} to {self.output_stream}")
-            return message_id
+            logger.debug("Published %d facts to %s", len(facts), self.output_stream)
+            return message_ids
             
         except Exception as e:
-            logger.error(f"Failed to publish fact: {e}")
+            logger.error(f"Failed to publish facts: {e}")
             raise
     
     async def get_stats(self) -> Dict[str, Any]:
@@ -2,6 +2,7 @@ import json
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from time import perf_counter_ns
 import asyncio
 import httpx
 from groq import AsyncGroq
@@ -13,6 +14,29 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Fact types whose values must be strictly positive
+_POSITIVE_FACT_TYPES = frozenset({FactType.PRICE, FactType.MARKET_CAP, FactType.VOLUME})
+
+_MISSING = object()
+
+# Market data field tables: (source key, attribute, confidence, fact type, metadata)
+_COINGECKO_FIELDS = (
+    ("usd", "price_usd", 0.95, FactType.PRICE, {"currency": "USD"}),
+    ("usd_market_cap", "market_cap_usd", 0.95, FactType.MARKET_CAP, {"currency": "USD"}),
+    ("usd_24h_vol", "volume_24h_usd", 0.90, FactType.VOLUME, {"period": "24h", "currency": "USD"}),
+    ("usd_24h_change", "price_change_24h_percent", 0.90, FactType.TECHNICAL, {"period": "24h", "unit": "percent"}),
+)
+
+_COINMARKETCAP_FIELDS = (
+    ("price", "price_usd", 0.98, FactType.PRICE, {"currency": "USD"}),
+    ("market_cap", "market_cap_usd", 0.98, FactType.MARKET_CAP, {"currency": "USD"}),
+    ("volume_24h", "volume_24h_usd", 0.95, FactType.VOLUME, {"period": "24h", "currency": "USD"}),
+) + tuple(
+    (f"percent_change_{period}", f"price_change_{period}_percent", 0.95, FactType.TECHNICAL,
+     {"period": period, "unit": "percent"})
+    for period in ("1h", "24h", "7d")
+)
+
 class FactExtractor:
     """Extracts structured facts from raw crypto data using Groq LLM"""
     
@@ -59,7 +83,7 @@ class FactExtractor:
     
     async def extract_facts(self, raw_data: Dict[str, Any]) -> List[ExtractedFact]:
         """Extract facts from raw crypto data"""
-        start_time = datetime.utcnow()
+        start_ns = perf_counter_ns()
         
         try:
             self.stats["total_processed"] += 1
@@ -82,7 +106,7 @@ class FactExtractor:
             anomalies = await self._detect_anomalies(facts, crypto_data)
             
             # Update stats
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
+            processing_time = (perf_counter_ns() - start_ns) * 1e-9
             self.stats["successful_extractions"] += 1
             self.stats["facts_extracted"] += len(facts)
             self.stats["anomalies_detected"] += len(anomalies)
@@ -93,7 +117,7 @@ class FactExtractor:
             if len(self.stats["processing_times"]) > 100:
                 self.stats["processing_times"] = self.stats["processing_times"][-100:]
             
-            logger.info(f"Extracted {len(facts)} facts from {crypto_data.source} for {crypto_data.symbol}")
+            logger.info("Extracted %d facts from %s for %s", len(facts), crypto_data.source, crypto_data.symbol)
             return facts
             
         except Exception as e:
@@ -103,150 +127,55 @@ class FactExtractor:
     
     async def _extract_coingecko_facts(self, data: RawCryptoData) -> List[ExtractedFact]:
         """Extract facts from CoinGecko data"""
-        facts = []
         timestamp = datetime.fromisoformat(data.timestamp)
         
         try:
-            crypto_data = data.data
-            
-            # Price fact
-            if "usd" in crypto_data:
-                price = crypto_data["usd"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="price_usd",
-                    value=price,
-                    timestamp=timestamp,
-                    source=DataSource.COINGECKO,
-                    confidence=0.95,
-                    fact_type=FactType.PRICE,
-                    raw_data=crypto_data,
-                    metadata={"currency": "USD"}
-                ))
-            
-            # Market cap fact
-            if "usd_market_cap" in crypto_data:
-                market_cap = crypto_data["usd_market_cap"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="market_cap_usd",
-                    value=market_cap,
-                    timestamp=timestamp,
-                    source=DataSource.COINGECKO,
-                    confidence=0.95,
-                    fact_type=FactType.MARKET_CAP,
-                    raw_data=crypto_data,
-                    metadata={"currency": "USD"}
-                ))
-            
-            # Volume fact
-            if "usd_24h_vol" in crypto_data:
-                volume = crypto_data["usd_24h_vol"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="volume_24h_usd",
-                    value=volume,
-                    timestamp=timestamp,
-                    source=DataSource.COINGECKO,
-                    confidence=0.90,
-                    fact_type=FactType.VOLUME,
-                    raw_data=crypto_data,
-                    metadata={"period": "24h", "currency": "USD"}
-                ))
-            
-            # Price change fact
-            if "usd_24h_change" in crypto_data:
-                change = crypto_data["usd_24h_change"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="price_change_24h_percent",
-                    value=change,
-                    timestamp=timestamp,
-                    source=DataSource.COINGECKO,
-                    confidence=0.90,
-                    fact_type=FactType.TECHNICAL,
-                    raw_data=crypto_data,
-                    metadata={"period": "24h", "unit": "percent"}
-                ))
-                
+            return self._extract_market_facts(data, timestamp, data.data, _COINGECKO_FIELDS, DataSource.COINGECKO)
         except Exception as e:
             logger.error(f"Error extracting CoinGecko facts: {e}")
-        
-        return facts
+            return []
     
     async def _extract_coinmarketcap_facts(self, data: RawCryptoData) -> List[ExtractedFact]:
         """Extract facts from CoinMarketCap data"""
-        facts = []
         timestamp = datetime.fromisoformat(data.timestamp)
         
         try:
-            crypto_data = data.data
-            quote = crypto_data.get("quote", {}).get("USD", {})
-            
-            # Price fact
-            if "price" in quote:
-                price = quote["price"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="price_usd",
-                    value=price,
-                    timestamp=timestamp,
-                    source=DataSource.COINMARKETCAP,
-                    confidence=0.98,
-                    fact_type=FactType.PRICE,
-                    raw_data=crypto_data,
-                    metadata={"currency": "USD"}
-                ))
-            
-            # Market cap fact
-            if "market_cap" in quote:
-                market_cap = quote["market_cap"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="market_cap_usd",
-                    value=market_cap,
-                    timestamp=timestamp,
-                    source=DataSource.COINMARKETCAP,
-                    confidence=0.98,
-                    fact_type=FactType.MARKET_CAP,
-                    raw_data=crypto_data,
-                    metadata={"currency": "USD"}
-                ))
-            
-            # Volume fact
-            if "volume_24h" in quote:
-                volume = quote["volume_24h"]
-                facts.append(ExtractedFact(
-                    token=data.symbol,
-                    attribute="volume_24h_usd",
-                    value=volume,
+            quote = data.data.get("quote", {}).get("USD", {})
+            return self._extract_market_facts(data, timestamp, quote, _COINMARKETCAP_FIELDS, DataSource.COINMARKETCAP)
+        except Exception as e:
+            logger.error(f"Error extracting CoinMarketCap facts: {e}")
+            return []
+    
+    def _extract_market_facts(
+        self,
+        data: RawCryptoData,
+        timestamp: datetime,
+        values: Dict[str, Any],
+        fields: tuple,
+        source: DataSource
+    ) -> List[ExtractedFact]:
+        """Build one fact per field present in values, driven by a field table"""
+        facts = []
+        crypto_data = data.data
+        token = data.symbol
+        # Bind per-call lookups to locals once rather than per field
+        append = facts.append
+        get = values.get
+        
+        for key, attribute, confidence, fact_type, metadata in fields:
+            value = get(key, _MISSING)
+            if value is not _MISSING:
+                append(ExtractedFact(
+                    token=token,
+                    attribute=attribute,
+                    value=value,
                     timestamp=timestamp,
-                    source=DataSource.COINMARKETCAP,
-                    confidence=0.95,
-                    fact_type=FactType.VOLUME,
+                    source=source,
+                    confidence=confidence,
+                    fact_type=fact_type,
                     raw_data=crypto_data,
-                    metadata={"period": "24h", "currency": "USD"}
+                    metadata=metadata  # copied by pydantic on validation
                 ))
-            
-            # Price change facts
-            for period in ["1h", "24h", "7d"]:
-                change_key = f"percent_change_{period}"
-                if change_key in quote:
-                    change = quote[change_key]
-                    facts.append(ExtractedFact(
-                        token=data.symbol,
-                        attribute=f"price_change_{period}_percent",
-                        value=change,
-                        timestamp=timestamp,
-                        source=DataSource.COINMARKETCAP,
-                        confidence=0.95,
-                        fact_type=FactType.TECHNICAL,
-                        raw_data=crypto_data,
-                        metadata={"period": period, "unit": "percent"}
-                    ))
-                    
-        except Exception as e:
-            logger.error(f"Error extracting CoinMarketCap facts: {e}")
         
         return facts
     
@@ -354,37 +283,45 @@ class FactExtractor:
         anomalies = []
         
         try:
+            # Single pass over the facts for all per-fact checks
+            has_price = False
+            for fact in facts:
+                fact_type = fact.fact_type
+                value = fact.value
+                is_number = isinstance(value, (int, float))
+                
+                if fact_type == FactType.PRICE:
+                    has_price = True
+                
+                if not is_number:
+                    continue
+                
+                # Check for extreme price changes
+                if fact.attribute.endswith("_percent") and abs(value) > 50:  # More than 50% change
+                    anomalies.append(AnomalyDetection(
+                        is_anomaly=True,
+                        anomaly_type="extreme_price_change",
+                        severity=min(abs(value) / 100, 1.0),
+                        description=f"Extreme price change detected: {value}% for {fact.token}"
+                    ))
+                
+                # Check for zero or negative values where they shouldn't be
+                if fact_type in _POSITIVE_FACT_TYPES and value <= 0:
+                    anomalies.append(AnomalyDetection(
+                        is_anomaly=True,
+                        anomaly_type="invalid_value",
+                        severity=0.9,
+                        description=f"Invalid {fact.attribute} value: {value} for {fact.token}"
+                    ))
+            
             # Check for missing critical fields
-            price_facts = [f for f in facts if f.fact_type == FactType.PRICE]
-            if not price_facts and raw_data.source in ["coingecko", "coinmarketcap"]:
-                anomalies.append(AnomalyDetection(
+            if not has_price and raw_data.source in ("coingecko", "coinmarketcap"):
+                anomalies.insert(0, AnomalyDetection(
                     is_anomaly=True,
                     anomaly_type="missing_price_data",
                     severity=0.8,
                     description=f"No price data found for {raw_data.symbol} from {raw_data.source}"
                 ))
-            
-            # Check for extreme price changes
-            for fact in facts:
-                if fact.attribute.endswith("_percent") and isinstance(fact.value, (int, float)):
-                    if abs(fact.value) > 50:  # More than 50% change
-                        anomalies.append(AnomalyDetection(
-                            is_anomaly=True,
-                            anomaly_type="extreme_price_change",
-                            severity=min(abs(fact.value) / 100, 1.0),
-                            description=f"Extreme price change detected: {fact.value}% for {fact.token}"
-                        ))
-            
-            # Check for zero or negative values where they shouldn't be
-            for fact in facts:
-                if fact.fact_type in [FactType.PRICE, FactType.MARKET_CAP, FactType.VOLUME]:
-                    if isinstance(fact.value, (int, float)) and fact.value <= 0:
-                        anomalies.append(AnomalyDetection(
-                            is_anomaly=True,
-                            anomaly_type="invalid_value",
-                            severity=0.9,
-                            description=f"Invalid {fact.attribute} value: {fact.value} for {fact.token}"
-                        ))
                         
         except Exception as e:
             logger.error(f"Error detecting anomalies: {e}")
@@ -139,7 +139,7 @@ async def manual_extraction(raw_data: Dict[str, Any]):
         return {
             "status": "success",
             "facts_extracted": len(facts),
-            "facts": [fact.dict() for fact in facts],
+            "facts": [fact.model_dump() for fact in facts],
             "timestamp": datetime.utcnow()
         }
         
@@ -23,5 +23,6 @@ class Settings(BaseSettings):
     
     class Config:
         env_file = ".env"
+        frozen = True
 
 settings = Settings()
\ No newline at end of file
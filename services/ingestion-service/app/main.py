@@ -81,6 +81,9 @@ async def shutdown_event():
     if background_task:
         background_task.cancel()
         
+    if ingester:
+        await ingester.close()
+        
     if producer:
         await producer.close()
         
@@ -1,7 +1,7 @@
 import redis.asyncio as redis
-import json
+import orjson
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -24,21 +24,25 @@ class MessageProducer:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
     
+    def _build_crypto_message(self, data: Dict[str, Any], source: str, symbol: str, now: datetime) -> Dict[str, str]:
+        """Build the stream entry for one symbol's crypto data"""
+        return {
+            "source": source,
+            "symbol": symbol,
+            "data": orjson.dumps(data),
+            "timestamp": now.isoformat(),
+            "message_id": f"{source}_{symbol}_{int(now.timestamp())}"
+        }
+    
     async def publish_crypto_data(self, data: Dict[str, Any], source: str, symbol: str) -> str:
         """Publish crypto data to Redis stream"""
         try:
-            message = {
-                "source": source,
-                "symbol": symbol,
-                "data": json.dumps(data),
-                "timestamp": datetime.utcnow().isoformat(),
-                "message_id": f"{source}_{symbol}_{int(datetime.utcnow().timestamp())}"
-            }
+            message = self._build_crypto_message(data, source, symbol, datetime.utcnow())
             
             # Add to Redis stream
             message_id = await self.redis_client.xadd(self.stream_name, message)
             
-            logger.debug(f"Published {source} data for {symbol} to stream {self.stream_name}")
+            logger.debug("Published %s data for %s to stream %s", source, symbol, self.stream_name)
             return message_id
             
         except Exception as e:
@@ -51,20 +55,31 @@ class MessageProducer:
             message = {
                 "source": "news_api",
                 "query": query,
-                "data": json.dumps(articles),
+                "data": orjson.dumps(articles),
                 "timestamp": datetime.utcnow().isoformat(),
                 "message_id": f"news_{query}_{int(datetime.utcnow().timestamp())}"
             }
             
             message_id = await self.redis_client.xadd(self.stream_name, message)
             
-            logger.debug(f"Published news data for query '{query}' to stream {self.stream_name}")
+            logger.debug("Published news data for query '%s' to stream %s", query, self.stream_name)
             return message_id
             
         except Exception as e:
             logger.error(f"Failed to publish news message: {e}")
             raise
     
+    async def publish_crypto_batch(self, items: List[Tuple[str, Dict[str, Any]]], source: str) -> list:
+        """Publish (symbol, data) pairs from one fetch in a single pipeline round trip"""
+        if not items:
+            return []
+        
+        now = datetime.utcnow()
+        return await self.publish_batch([
+            self._build_crypto_message(data, source, symbol, now)
+            for symbol, data in items
+        ])
+    
     async def publish_batch(self, messages: list) -> list:
         """Publish multiple messages in batch"""
         try:
@@ -79,7 +94,7 @@ class MessageProducer:
             results = await pipe.execute()
             message_ids.extend(results)
             
-            logger.info(f"Published batch of {len(messages)} messages to {self.stream_name}")
+            logger.info("Published batch of %d messages to %s", len(messages), self.stream_name)
             return message_ids
             
         except Exception as e:
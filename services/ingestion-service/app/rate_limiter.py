@@ -0,0 +1,122 @@
+import asyncio
+import time
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Proactive sliding-window + reactive header-based rate limiter with AIMD concurrency"""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        max_concurrency: int = 8,
+        remaining_threshold: float = 0.1,
+        alpha: float = 0.5,
+        beta: float = 0.5
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrency = max_concurrency
+        self.remaining_threshold = remaining_threshold  # pause when remaining < 10% of limit
+        self.alpha = alpha  # additive increase on success
+        self.beta = beta    # multiplicative decrease on 429
+
+        self.window: deque = deque()  # monotonic timestamps of requests in the last minute
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttled_count = 0
+
+        self._window_lock = asyncio.Lock()
+        self._slots = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait for a concurrency slot and a free spot in the per-minute window"""
+        async with self._slots:
+            await self._slots.wait_for(lambda: self.in_flight < int(self.concurrency))
+            self.in_flight += 1
+
+        try:
+            await self._wait_for_window()
+        except BaseException:
+            await self._release_slot()
+            raise
+
+    async def release(self, response: Optional[httpx.Response]):
+        """Release the slot and adapt to the response's status and rate limit headers"""
+        if response is not None:
+            throttled = response.status_code == 429
+            self._apply_headers(response.headers, throttled)
+            self._adjust_concurrency(throttled)
+        await self._release_slot()
+
+    async def _wait_for_window(self):
+        async with self._window_lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                while self.window and now - self.window[0] >= 60:
+                    self.window.popleft()
+
+                if len(self.window) < self.requests_per_minute:
+                    self.window.append(now)
+                    return
+
+                # Sleep until the oldest request leaves the window
+                await asyncio.sleep(60 - (now - self.window[0]))
+
+    async def _release_slot(self):
+        async with self._slots:
+            self.in_flight -= 1
+            self._slots.notify_all()
+
+    def _adjust_concurrency(self, throttled: bool):
+        if throttled:
+            self.throttled_count += 1
+            self.concurrency = max(1.0, self.concurrency * self.beta)
+        else:
+            self.concurrency = min(float(self.max_concurrency), self.concurrency + self.alpha)
+
+    def _apply_headers(self, headers: httpx.Headers, throttled: bool):
+        retry_after = _parse_number(headers.get("retry-after"))
+        remaining = _parse_number(headers.get("x-ratelimit-remaining"))
+        limit = _parse_number(headers.get("x-ratelimit-limit")) or self.requests_per_minute
+
+        if throttled:
+            pause = retry_after or 1.0
+            logger.warning("Received 429, pausing requests for %.1fs", pause)
+        elif remaining is not None and remaining < limit * self.remaining_threshold:
+            pause = retry_after or 1.0
+            logger.warning("Rate limit nearly exhausted (%.0f left), pausing requests for %.1fs", remaining, pause)
+        else:
+            return
+
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current limiter state"""
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "requests_in_window": len(self.window),
+            "concurrency_limit": round(self.concurrency, 2),
+            "in_flight": self.in_flight,
+            "throttled_responses": self.throttled_count,
+            "paused": time.monotonic() < self.paused_until
+        }
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    """Parse a numeric header value, ignoring HTTP-date style values"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -1,17 +1,28 @@
 import httpx
 import asyncio
 import logging
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import os
-import json
+import orjson
 from .producer import MessageProducer
+from .rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
 class CryptoDataIngester:
     """Main service class for ingesting crypto data from multiple APIs"""
     
+    # Query parameters shared by every simple/price call; "ids" is overlaid per batch
+    _COINGECKO_PRICE_PARAMS = MappingProxyType({
+        "vs_currencies": "usd",
+        "include_market_cap": "true",
+        "include_24hr_vol": "true",
+        "include_24hr_change": "true",
+        "include_last_updated_at": "true"
+    })
+    
     def __init__(self, producer: MessageProducer):
         self.producer = producer
         
@@ -25,10 +36,34 @@ class CryptoDataIngester:
         self.coingecko_base = "https://api.coingecko.com/api/v3"
         self.news_api_base = "https://newsapi.org/v2"
         
+        # Endpoint URLs, joined once
+        self.coingecko_ping_url = f"{self.coingecko_base}/ping"
+        self.coingecko_price_url = f"{self.coingecko_base}/simple/price"
+        self.coinmarketcap_map_url = f"{self.coinmarketcap_base}/cryptocurrency/map"
+        self.coinmarketcap_quotes_url = f"{self.coinmarketcap_base}/cryptocurrency/quotes/latest"
+        self.news_everything_url = f"{self.news_api_base}/everything"
+        
+        self.coingecko_price_params = dict(self._COINGECKO_PRICE_PARAMS)
+        if self.coingecko_api_key:
+            self.coingecko_price_params["x_cg_demo_api_key"] = self.coingecko_api_key
+        
         # Rate limiting
         self.last_fetch_times = {}
         self.min_fetch_interval = 60  # 1 minute between fetches per source
         
+        # Shared HTTP client, bounded concurrency
+        self.client: Optional[httpx.AsyncClient] = None
+        self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "16"))
+        self.request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        self.coingecko_batch_size = 50  # ids per simple/price call
+        self.max_throttle_retries = 3
+        
+        # CoinGecko demo tier allows 30 requests per minute
+        self.coingecko_limiter = RateLimiter(
+            requests_per_minute=int(os.getenv("COINGECKO_RATE_LIMIT_RPM", "30")),
+            max_concurrency=8
+        )
+        
         # Statistics
         self.stats = {
             "total_fetches": 0,
@@ -45,6 +80,18 @@ class CryptoDataIngester:
     async def initialize(self):
         """Initialize the ingester"""
         try:
+            # Keep-alive connection pool shared by all API calls; HTTP/2
+            # multiplexes concurrent batches over one connection per host
+            self.client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrent_requests,
+                    max_keepalive_connections=self.max_concurrent_requests,
+                    keepalive_expiry=30.0
+                )
+            )
+            
             # Create consumer group for processing
             await self.producer.create_consumer_group()
             
@@ -57,15 +104,47 @@ class CryptoDataIngester:
             logger.error(f"Failed to initialize ingester: {e}")
             raise
     
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+    
+    async def _get(self, url: str, limiter: Optional[RateLimiter] = None, **kwargs) -> httpx.Response:
+        """GET through the shared client, bounded by the request semaphore and optional rate limiter"""
+        if limiter is None:
+            async with self.request_semaphore:
+                return await self.client.get(url, **kwargs)
+        
+        for attempt in range(self.max_throttle_retries + 1):
+            # Wait on the limiter before taking a shared connection slot
+            await limiter.acquire()
+            response = None
+            try:
+                async with self.request_semaphore:
+                    response = await self.client.get(url, **kwargs)
+            finally:
+                await limiter.release(response)
+            
+            # The limiter has already scheduled the retry-after pause
+            if response.status_code != 429:
+                break
+            logger.warning("Throttled by %s (attempt %d)", url, attempt + 1)
+        
+        return response
+    
     async def _test_api_connections(self):
         """Test connections to all APIs"""
         # Test CoinGecko (no API key required)
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.coingecko_base}/ping")
-                if response.status_code == 200:
-                    self.stats["sources_status"]["coingecko"] = "healthy"
-                    logger.info("CoinGecko API connection successful")
+            response = await self._get(
+                self.coingecko_ping_url,
+                limiter=self.coingecko_limiter,
+                timeout=10.0
+            )
+            if response.status_code == 200:
+                self.stats["sources_status"]["coingecko"] = "healthy"
+                logger.info("CoinGecko API connection successful")
         except Exception as e:
             self.stats["sources_status"]["coingecko"] = "unhealthy"
             logger.warning(f"CoinGecko API test failed: {e}")
@@ -74,15 +153,15 @@ class CryptoDataIngester:
         if self.coinmarketcap_api_key:
             try:
                 headers = {"X-CMC_PRO_API_KEY": self.coinmarketcap_api_key}
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.get(
-                        f"{self.coinmarketcap_base}/cryptocurrency/map",
-                        headers=headers,
-                        params={"limit": 1}
-                    )
-                    if response.status_code == 200:
-                        self.stats["sources_status"]["coinmarketcap"] = "healthy"
-                        logger.info("CoinMarketCap API connection successful")
+                response = await self._get(
+                    self.coinmarketcap_map_url,
+                    headers=headers,
+                    params={"limit": 1},
+                    timeout=10.0
+                )
+                if response.status_code == 200:
+                    self.stats["sources_status"]["coinmarketcap"] = "healthy"
+                    logger.info("CoinMarketCap API connection successful")
             except Exception as e:
                 self.stats["sources_status"]["coinmarketcap"] = "unhealthy"
                 logger.warning(f"CoinMarketCap API test failed: {e}")
@@ -95,11 +174,10 @@ class CryptoDataIngester:
                     "q": "bitcoin",
                     "pageSize": 1
                 }
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.get(f"{self.news_api_base}/everything", params=params)
-                    if response.status_code == 200:
-                        self.stats["sources_status"]["news_api"] = "healthy"
-                        logger.info("News API connection successful")
+                response = await self._get(self.news_everything_url, params=params, timeout=10.0)
+                if response.status_code == 200:
+                    self.stats["sources_status"]["news_api"] = "healthy"
+                    logger.info("News API connection successful")
             except Exception as e:
                 self.stats["sources_status"]["news_api"] = "unhealthy"
                 logger.warning(f"News API test failed: {e}")
@@ -148,48 +226,49 @@ class CryptoDataIngester:
             return
         
         try:
-            # Convert symbols to CoinGecko IDs format
-            symbol_ids = ",".join(symbols)
-            
-            params = {
-                "ids": symbol_ids,
-                "vs_currencies": "usd",
-                "include_market_cap": "true",
-                "include_24hr_vol": "true",
-                "include_24hr_change": "true",
-                "include_last_updated_at": "true"
-            }
-            
-            if self.coingecko_api_key:
-                params["x_cg_demo_api_key"] = self.coingecko_api_key
+            # Split large symbol lists and fetch the batches concurrently
+            batches = [
+                symbols[i:i + self.coingecko_batch_size]
+                for i in range(0, len(symbols), self.coingecko_batch_size)
+            ]
+            results = await asyncio.gather(
+                *(self._fetch_coingecko_batch(batch) for batch in batches)
+            )
+            fetched = sum(results)
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.coingecko_base}/simple/price",
-                    params=params
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Publish each symbol's data
-                for symbol in symbols:
-                    if symbol in data:
-                        await self.producer.publish_crypto_data(
-                            data[symbol], 
-                            source, 
-                            symbol
-                        )
-                
-                self._update_fetch_time(source)
-                self.stats["sources_status"][source] = "healthy"
-                logger.info(f"Successfully fetched CoinGecko data for {len(data)} symbols")
+            self._update_fetch_time(source)
+            self.stats["sources_status"][source] = "healthy"
+            logger.info("Successfully fetched CoinGecko data for %d symbols", fetched)
                 
         except Exception as e:
             self.stats["sources_status"][source] = "unhealthy"
             logger.error(f"CoinGecko fetch failed: {e}")
             raise
     
+    async def _fetch_coingecko_batch(self, symbols: List[str]) -> int:
+        """Fetch and publish one batch of CoinGecko simple/price data"""
+        source = "coingecko"
+        
+        # Convert symbols to CoinGecko IDs format
+        params = {**self.coingecko_price_params, "ids": ",".join(symbols)}
+        
+        response = await self._get(
+            self.coingecko_price_url,
+            limiter=self.coingecko_limiter,
+            params=params
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        
+        # Publish all symbols' data in one pipeline
+        await self.producer.publish_crypto_batch(
+            [(symbol, data[symbol]) for symbol in symbols if symbol in data],
+            source
+        )
+        
+        return len(data)
+    
     async def _fetch_coinmarketcap_data(self, symbols: List[str], force: bool = False):
         """Fetch data from CoinMarketCap API"""
         source = "coinmarketcap"
@@ -207,29 +286,28 @@ class CryptoDataIngester:
                 "convert": "USD"
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.coinmarketcap_base}/cryptocurrency/quotes/latest",
-                    headers=headers,
-                    params=params
+            response = await self._get(
+                self.coinmarketcap_quotes_url,
+                headers=headers,
+                params=params
+            )
+            response.raise_for_status()
+            
+            data = orjson.loads(response.content)
+            
+            # Publish all symbols' data in one pipeline
+            if "data" in data:
+                await self.producer.publish_crypto_batch(
+                    [
+                        (coin_data.get("slug", coin_id), coin_data)
+                        for coin_id, coin_data in data["data"].items()
+                    ],
+                    source
                 )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Publish each symbol's data
-                if "data" in data:
-                    for coin_id, coin_data in data["data"].items():
-                        symbol = coin_data.get("slug", coin_id)
-                        await self.producer.publish_crypto_data(
-                            coin_data,
-                            source,
-                            symbol
-                        )
-                
-                self._update_fetch_time(source)
-                self.stats["sources_status"][source] = "healthy"
-                logger.info(f"Successfully fetched CoinMarketCap data for {len(data.get('data', {}))} symbols")
+            
+            self._update_fetch_time(source)
+            self.stats["sources_status"][source] = "healthy"
+            logger.info("Successfully fetched CoinMarketCap data for %d symbols", len(data.get('data', {})))
                 
         except Exception as e:
             self.stats["sources_status"][source] = "unhealthy"
@@ -247,31 +325,11 @@ class CryptoDataIngester:
         try:
             # Create search queries for crypto symbols
             crypto_terms = ["cryptocurrency", "bitcoin", "ethereum", "crypto", "blockchain"]
+            since = (datetime.utcnow() - timedelta(hours=24)).isoformat()
             
-            for term in crypto_terms:
-                params = {
-                    "apiKey": self.news_api_key,
-                    "q": term,
-                    "language": "en",
-                    "sortBy": "publishedAt",
-                    "pageSize": 20,
-                    "from": (datetime.utcnow() - timedelta(hours=24)).isoformat()
-                }
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(
-                        f"{self.news_api_base}/everything",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    
-                    data = response.json()
-                    
-                    if "articles" in data and data["articles"]:
-                        await self.producer.publish_news_data(
-                            data["articles"],
-                            term
-                        )
+            await asyncio.gather(
+                *(self._fetch_news_term(term, since) for term in crypto_terms)
+            )
             
             self._update_fetch_time(source)
             self.stats["sources_status"][source] = "healthy"
@@ -282,6 +340,31 @@ class CryptoDataIngester:
             logger.error(f"News API fetch failed: {e}")
             raise
     
+    async def _fetch_news_term(self, term: str, since: str):
+        """Fetch and publish news articles for a single search term"""
+        params = {
+            "apiKey": self.news_api_key,
+            "q": term,
+            "language": "en",
+            "sortBy": "publishedAt",
+            "pageSize": 20,
+            "from": since
+        }
+        
+        response = await self._get(
+            self.news_everything_url,
+            params=params
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        
+        if "articles" in data and data["articles"]:
+            await self.producer.publish_news_data(
+                data["articles"],
+                term
+            )
+    
     def _should_fetch(self, source: str) -> bool:
         """Check if enough time has passed since last fetch"""
         last_fetch = self.last_fetch_times.get(source)
@@ -307,6 +390,9 @@ class CryptoDataIngester:
             "last_fetch_times": {
                 source: time.isoformat() if time else None
                 for source, time in self.last_fetch_times.items()
+            },
+            "rate_limits": {
+                "coingecko": self.coingecko_limiter.get_stats()
             }
         }
     
@@ -0,0 +1 @@
+# Makes the service's `app` package importable when running pytest from this directory or the repo root
@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import rate_limiter
+from app.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the limiter sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_waits_for_oldest_request_to_leave_window(clock):
+    async def run():
+        limiter = RateLimiter(requests_per_minute=2)
+        for at in (0.0, 10.0):
+            clock.now = at
+            await limiter.acquire()
+            await limiter.release(None)
+
+        await limiter.acquire()
+        await limiter.release(None)
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    assert clock.sleeps == [50.0]
+    assert clock.now == 60.0
+    assert len(limiter.window) == 2
+
+
+def test_pauses_on_429_with_retry_after(clock):
+    async def run():
+        limiter = RateLimiter(requests_per_minute=100)
+        await limiter.acquire()
+        await limiter.release(httpx.Response(429, headers={"retry-after": "5"}))
+        assert limiter.get_stats()["paused"]
+
+        await limiter.acquire()
+        await limiter.release(None)
+
+    asyncio.run(run())
+
+    assert clock.sleeps == [5.0]
+    assert clock.now == 5.0
+
+
+def test_halves_concurrency_on_429(clock):
+    async def run():
+        limiter = RateLimiter(requests_per_minute=100, max_concurrency=8)
+        await limiter.acquire()
+        await limiter.release(httpx.Response(429))
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    assert limiter.concurrency == 4.0
+    assert limiter.throttled_count == 1
@@ -38,7 +38,7 @@ class GroqLLMGenerator:
             confidence_score = self._calculate_confidence(relevant_facts, hallucination_detected)
             
             # Extract sources
-            sources = list(set([f"{fact.source.value}" for fact in relevant_facts]))
+            sources = list({fact.source.value for fact in relevant_facts})
             
             return QueryResponse(
                 query=query,
@@ -58,13 +58,10 @@ class GroqLLMGenerator:
         if not facts:
             return "No relevant information found."
         
-        context_parts = []
-        for fact in facts:
-            context_parts.append(
-                f"[{fact.source.value}] {fact.content} (Confidence: {fact.confidence_score:.2f})"
-            )
-        
-        return "\n".join(context_parts)
+        return "\n".join([
+            f"[{fact.source.value}] {fact.content} (Confidence: {fact.confidence_score:.2f})"
+            for fact in facts
+        ])
     
     async def _generate_with_groq(self, query: str, context: str) -> str:
         """Generate answer using Groq API"""
@@ -6,6 +6,11 @@ from .config import settings
 
 logger = setup_logging(settings.service_name)
 
+SYMBOL_RE = re.compile(r'\b[A-Z]{2,5}\b')
+# Uppercase tokens that look like tickers but aren't crypto symbols
+IGNORED_SYMBOLS = frozenset({'USD', 'API', 'LLM'})
+PRICE_RE = re.compile(r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)')
+
 class HallucinationChecker:
     """Detects potential hallucinations in LLM responses"""
     
@@ -17,6 +22,8 @@ class HallucinationChecker:
             r'(according to|sources say|reports indicate)',  # Vague attributions
             r'(breaking|just announced|recently revealed)',  # Urgency without context
         ]
+        # Single alternation so the text is scanned once instead of once per pattern
+        self._suspicious_re = re.compile("|".join(f"(?:{p})" for p in self.suspicious_patterns))
         
         # Confidence thresholds
         self.price_variance_threshold = 0.1  # 10% variance allowed
@@ -48,36 +55,18 @@ class HallucinationChecker:
     
     def _check_suspicious_patterns(self, text: str) -> bool:
         """Check for suspicious patterns that might indicate hallucination"""
-        text_lower = text.lower()
-        
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, text_lower):
-                return True
-        
-        return False
+        return self._suspicious_re.search(text.lower()) is not None
     
     def _check_fact_consistency(self, text: str, facts: List[CryptoFact]) -> bool:
         """Check if generated text is consistent with source facts"""
         if not facts:
             return False
         
-        text_lower = text.lower()
-        
-        # Extract symbols mentioned in the text
-        mentioned_symbols = set()
-        for fact in facts:
-            if fact.symbol.lower() in text_lower:
-                mentioned_symbols.add(fact.symbol)
-        
-        # Check if text mentions symbols not in source facts
-        fact_symbols = set(fact.symbol for fact in facts)
-        
-        # Extract potential crypto symbols from text (simplified)
-        potential_symbols = re.findall(r'\b[A-Z]{2,5}\b', text)
-        crypto_symbols = [s for s in potential_symbols if len(s) <= 5 and s not in ['USD', 'API', 'LLM']]
+        # Symbols mentioned in the text are fine as long as a source fact backs them
+        known_symbols = IGNORED_SYMBOLS.union(fact.symbol for fact in facts)
         
-        for symbol in crypto_symbols:
-            if symbol not in fact_symbols and symbol not in mentioned_symbols:
+        for symbol in SYMBOL_RE.findall(text):
+            if symbol not in known_symbols:
                 logger.warning(f"Text mentions symbol {symbol} not in source facts")
                 return True
         
@@ -86,8 +75,7 @@ class HallucinationChecker:
     def _check_price_accuracy(self, text: str, facts: List[CryptoFact]) -> bool:
         """Check if price information in text matches source facts"""
         # Extract price mentions from text
-        price_pattern = r'\$(\d+(?:,\d{3})*(?:\.\d{2})?)'
-        price_matches = re.findall(price_pattern, text)
+        price_matches = PRICE_RE.findall(text)
         
         if not price_matches:
             return False
@@ -165,7 +165,7 @@ async def continuous_health_monitoring():
                 redis_client.setex(
                     f"health:{service_name}",
                     300,
-                    json.dumps(health.dict(), default=str)
+                    json.dumps(health.model_dump(), default=str)
                 )
             
             await update_system_metrics()
@@ -326,7 +326,7 @@ async def log_healing_event(service_name: str, issue_type: str, action: HealingA
             details=details
         )
         
-        await db.healing_events.insert_one(event.dict())
+        await db.healing_events.insert_one(event.model_dump())
         
     except Exception as e:
         logger.error(f"Failed to log healing event: {e}")
@@ -365,7 +365,7 @@ async def get_system_health():
             
         return {
             "system_metrics": metrics,
-            "service_health": {name: health.dict() for name, health in service_health.items()},
+            "service_health": {name: health.model_dump() for name, health in service_health.items()},
             "circuit_breakers": circuit_breakers
         }
     except Exception as e:
@@ -52,7 +52,7 @@ async def health_check():
 @app.post("/facts")
 async def store_fact(fact: FactModel):
     try:
-        fact_dict = fact.dict()
+        fact_dict = fact.model_dump()
         fact_dict["timestamp"] = datetime.utcnow()
         result = await db.facts.insert_one(fact_dict)
         return {"id": str(result.inserted_id), "status": "stored"}
@@ -4,10 +4,13 @@ import chromadb
 from chromadb.config import Settings
 import os
 import logging
+import time
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 import asyncio
 import httpx
+from collections import OrderedDict
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +29,15 @@ app.add_middleware(
 CHROMA_URL = os.getenv("CHROMA_URL", "http://localhost:8000")
 EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL", "http://embedding-service:8003")
 
+# HNSW index settings for new collections. Embeddings are L2-normalized
+# by the embedding service, so inner product equals cosine similarity and
+# similarity = 1 - distance holds without per-query renormalization.
+HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 100
+}
+
 # Initialize ChromaDB client
 try:
     chroma_host = CHROMA_URL.replace("http://", "").replace("https://", "").split(":")[0]
@@ -81,7 +93,8 @@ async def startup_event():
                         name=collection_name,
                         metadata={
                             "description": f"Collection for {collection_name.replace('_', ' ')}",
-                            "created_at": str(asyncio.get_event_loop().time())
+                            "created_at": str(asyncio.get_event_loop().time()),
+                            **HNSW_METADATA
                         }
                     )
                     logger.info(f"Created collection: {collection_name}")
@@ -119,7 +132,7 @@ async def get_embeddings(texts: List[str]) -> List[List[float]]:
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 f"{EMBEDDING_SERVICE_URL}/embed",
-                json={"texts": texts},
+                json={"texts": texts, "normalize": True},
                 timeout=30.0
             )
             response.raise_for_status()
@@ -128,6 +141,56 @@ async def get_embeddings(texts: List[str]) -> List[List[float]]:
         logger.error(f"Failed to get embeddings: {e}")
         raise HTTPException(status_code=500, detail=f"Embedding service error: {str(e)}")
 
+# Query embeddings memoized by text; repeated questions skip the embedding service
+QUERY_EMBEDDING_CACHE_SIZE = 512
+query_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+
+async def get_query_embedding(text: str) -> List[float]:
+    """Get a normalized query embedding, reusing recently computed ones"""
+    embedding = query_embedding_cache.get(text)
+    if embedding is not None:
+        query_embedding_cache.move_to_end(text)
+        return embedding
+    
+    embedding = (await get_embeddings([text]))[0]
+    query_embedding_cache[text] = embedding
+    if len(query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+        query_embedding_cache.popitem(last=False)
+    return embedding
+
+# /query responses memoized per (collection, query parameters). Facts are also
+# written to Chroma directly by the embedding service, so entries expire after
+# QUERY_RESULT_CACHE_TTL seconds in addition to being dropped on local writes.
+QUERY_RESULT_CACHE_SIZE = 1024
+QUERY_RESULT_CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))
+query_result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+def get_cached_query_result(key: tuple) -> Optional[Dict[str, Any]]:
+    """Return a cached /query response if present and not expired"""
+    entry = query_result_cache.get(key)
+    if entry is None:
+        return None
+    
+    expires_at, result = entry
+    if expires_at <= time.monotonic():
+        del query_result_cache[key]
+        return None
+    
+    query_result_cache.move_to_end(key)
+    return result
+
+def cache_query_result(key: tuple, result: Dict[str, Any]):
+    """Store a /query response, evicting the least recently used entry when full"""
+    query_result_cache[key] = (time.monotonic() + QUERY_RESULT_CACHE_TTL, result)
+    query_result_cache.move_to_end(key)
+    if len(query_result_cache) > QUERY_RESULT_CACHE_SIZE:
+        query_result_cache.popitem(last=False)
+
+def invalidate_query_results(collection_name: str):
+    """Drop cached /query responses for a collection after it changes"""
+    for key in [key for key in query_result_cache if key[0] == collection_name]:
+        del query_result_cache[key]
+
 @app.post("/store")
 async def store_vectors(data: StoreModel):
     """Store vectors in ChromaDB with embeddings"""
@@ -142,7 +205,7 @@ async def store_vectors(data: StoreModel):
         try:
             collection = chroma_client.get_collection(data.collection_name)
         except:
-            collection = chroma_client.create_collection(data.collection_name)
+            collection = chroma_client.create_collection(data.collection_name, metadata=HNSW_METADATA)
         
         # Store in ChromaDB
         collection.add(
@@ -151,8 +214,9 @@ async def store_vectors(data: StoreModel):
             ids=data.ids,
             embeddings=embeddings
         )
+        invalidate_query_results(data.collection_name)
         
-        logger.info(f"Stored {len(data.texts)} vectors in collection {data.collection_name}")
+        logger.info("Stored %d vectors in collection %s", len(data.texts), data.collection_name)
         
         return {
             "status": "stored",
@@ -170,43 +234,63 @@ async def query_vectors(query: QueryModel):
     try:
         if not chroma_client:
             raise HTTPException(status_code=503, detail="ChromaDB not available")
+        
+        cache_key = (
+            query.collection_name,
+            query.query_text,
+            query.n_results,
+            query.similarity_threshold,
+            query.include_metadata
+        )
+        cached = get_cached_query_result(cache_key)
+        if cached is not None:
+            return cached
             
         collection = chroma_client.get_collection(query.collection_name)
         
         # Get embedding for query
-        query_embedding = await get_embeddings([query.query_text])
+        query_embedding = await get_query_embedding(query.query_text)
         
         # Query ChromaDB
         results = collection.query(
-            query_embeddings=query_embedding,
+            query_embeddings=[query_embedding],
             n_results=query.n_results,
             include=["documents", "metadatas", "distances"]
         )
         
-        # Filter by similarity threshold
-        filtered_results = {
-            "documents": [],
-            "metadatas": [],
-            "distances": [],
-            "ids": []
-        }
+        # Filter by similarity threshold. Chroma returns hits sorted by
+        # distance, so a boolean mask keeps them in rank order.
+        if not results["distances"] or not results["distances"][0]:
+            response = {
+                "results": [],
+                "metadatas": [],
+                "similarities": [],
+                "ids": [],
+                "total_found": 0
+            }
+            cache_query_result(cache_key, response)
+            return response
         
-        if results["distances"] and results["distances"][0]:
-            for i, distance in enumerate(results["distances"][0]):
-                similarity = 1 - distance  # Convert distance to similarity
-                if similarity >= query.similarity_threshold:
-                    filtered_results["documents"].append(results["documents"][0][i])
-                    filtered_results["metadatas"].append(results["metadatas"][0][i] if query.include_metadata else {})
-                    filtered_results["distances"].append(distance)
-                    filtered_results["ids"].append(results["ids"][0][i])
+        similarities = 1.0 - np.asarray(results["distances"][0], dtype=np.float64)
+        keep = np.flatnonzero(similarities >= query.similarity_threshold).tolist()
         
-        return {
-            "results": filtered_results["documents"],
-            "metadatas": filtered_results["metadatas"],
-            "similarities": [1 - d for d in filtered_results["distances"]],
-            "ids": filtered_results["ids"],
-            "total_found": len(filtered_results["documents"])
+        documents = results["documents"][0]
+        ids = results["ids"][0]
+        if query.include_metadata:
+            metadatas = results["metadatas"][0]
+            kept_metadatas = [metadatas[i] for i in keep]
+        else:
+            kept_metadatas = [{} for _ in keep]
+        
+        response = {
+            "results": [documents[i] for i in keep],
+            "metadatas": kept_metadatas,
+            "similarities": similarities[keep].tolist(),
+            "ids": [ids[i] for i in keep],
+            "total_found": len(keep)
         }
+        cache_query_result(cache_key, response)
+        return response
         
     except Exception as e:
         logger.error(f"Error querying vectors: {e}")
@@ -221,11 +305,11 @@ async def rag_query(query: RAGQueryModel):
             
         # Step 1: Get initial results
         collection = chroma_client.get_collection(query.collection_name)
-        query_embedding = await get_embeddings([query.question])
+        query_embedding = await get_query_embedding(query.question)
         
         # Get more results for reranking
         initial_results = collection.query(
-            query_embeddings=query_embedding,
+            query_embeddings=[query_embedding],
             n_results=query.n_results * 2,  # Get more for reranking
             include=["documents", "metadatas", "distances"]
         )
@@ -349,6 +433,30 @@ async def list_collections():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/collections/{collection_name}/clear")
+async def clear_collection(collection_name: str, batch_size: int = 1000):
+    """Remove all documents from a collection in place, keeping it and its index settings"""
+    try:
+        if not chroma_client:
+            raise HTTPException(status_code=503, detail="ChromaDB not available")
+            
+        collection = chroma_client.get_collection(collection_name)
+        
+        removed = 0
+        while True:
+            ids = collection.get(limit=batch_size, include=[])["ids"]
+            if not ids:
+                break
+            collection.delete(ids=ids)
+            removed += len(ids)
+        invalidate_query_results(collection_name)
+        
+        logger.info("Cleared %d documents from collection %s", removed, collection_name)
+        return {"status": "cleared", "collection": collection_name, "removed": removed}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.delete("/collections/{collection_name}")
 async def delete_collection(collection_name: str):
     """Delete a collection"""
@@ -357,6 +465,7 @@ async def delete_collection(collection_name: str):
             raise HTTPException(status_code=503, detail="ChromaDB not available")
             
         chroma_client.delete_collection(collection_name)
+        invalidate_query_results(collection_name)
         return {"status": "deleted", "collection": collection_name}
         
     except Exception as e:
@@ -1,4 +1,7 @@
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import queue
 import asyncio
 import aiohttp
 from typing import Dict, Any, Optional
@@ -6,13 +9,37 @@ from datetime import datetime, timedelta
 import hashlib
 import json
 
+# Records from every service logger are written to stderr by one background
+# thread, so logging calls never block on the stream
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener: Optional[QueueListener] = None
+
+def _start_log_listener():
+    """Start the shared stderr listener once per process, stopping it at exit to flush pending records"""
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, logging.StreamHandler())
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
 def setup_logging(service_name: str, level: str = "INFO") -> logging.Logger:
     """Setup structured logging for services"""
+    # Skip per-record thread/process lookups; no formatter in the services uses them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    # Don't walk the stack for caller file/line on every record (no formatter shows them)
+    # and don't print tracebacks from handler errors in production
+    logging._srcfile = None
+    logging.raiseExceptions = False
+    
     logger = logging.getLogger(service_name)
     logger.setLevel(getattr(logging, level.upper()))
     
     if not logger.handlers:
-        handler = logging.StreamHandler()
+        _start_log_listener()
+        # QueueHandler formats in the caller, so each service keeps its own prefix
+        handler = QueueHandler(_log_queue)
         formatter = logging.Formatter(
             f'%(asctime)s - {service_name} - %(levelname)s - %(message)s'
         )
@@ -3,13 +3,8 @@
 Test individual services without Docker to check implementation
 """
 
-import sys
 import os
 import asyncio
-from pathlib import Path
-
-# Add services to path
-sys.path.append(str(Path(__file__).parent))
 
 async def test_embedding_service():
     """Test embedding service directly"""
@@ -0,0 +1,33 @@
+from batch_process import read_price_log, repair_price_log, update_json_batch
+
+
+def cryptos(log):
+    return [record.crypto for record in read_price_log(str(log))]
+
+
+def test_torn_trailing_payload_ends_log(tmp_path):
+    log = tmp_path / "prices.msgpack"
+    update_json_batch({"bitcoin": {"usd": 1.0}, "ethereum": {"usd": 2.0}}, str(log))
+    log.write_bytes(log.read_bytes()[:-5])
+
+    assert cryptos(log) == ["bitcoin"]
+
+
+def test_torn_trailing_header_ends_log(tmp_path):
+    log = tmp_path / "prices.msgpack"
+    update_json_batch({"bitcoin": {"usd": 1.0}, "ethereum": {"usd": 2.0}}, str(log))
+    with open(log, "ab") as f:
+        f.write(b"\x00\x01")
+
+    assert cryptos(log) == ["bitcoin", "ethereum"]
+
+
+def test_repair_keeps_appends_aligned_after_torn_frame(tmp_path):
+    log = tmp_path / "prices.msgpack"
+    update_json_batch({"bitcoin": {"usd": 1.0}, "ethereum": {"usd": 2.0}}, str(log))
+    log.write_bytes(log.read_bytes()[:-5])
+
+    repair_price_log(str(log))
+    update_json_batch({"solana": {"usd": 3.0}}, str(log))
+
+    assert cryptos(log) == ["bitcoin", "solana"]